@@ -6,23 +6,45 @@ dotenv.load_dotenv()
 
 """Configuration settings for supported LLMs."""
 
+# Defaults applied to every provider; any key can be overridden per provider.
+PROVIDER_DEFAULTS = {
+    "driver": "undetected",  # "undetected" (undetected_chromedriver) or "selenium"
+    "selector_type": "css",  # "css" or "xpath", used for every selector of the provider
+    "auth_steps": [],  # login steps, see llms/generic_automation.py
+    "wait_time_for_logging": 10,  # seconds to wait for each login step
+    "focus_input": False,  # click the input before typing
+    "clear_input": False,  # clear the input before typing
+    "completion_selector": None,  # element shown once the answer is complete
+    "page_load_wait": 10,  # seconds
+    "page_load_timeout": 60,  # seconds before a stalled page load fails the run
+    "empty_retry_wait": 10,  # seconds to wait before re-reading an empty response
+    "max_concurrency": None,  # max concurrent browsers for the provider
+    "persist_cookies": False,  # reuse session cookies across runs (needs shared state)
+}
+
 LLM_CONFIGS = {
     "chatgpt": {
         "url": "https://chat.openai.com/",
         "input_selector": "div.ProseMirror",
         "response_selector": "div.markdown.prose",
+        "focus_input": True,
+        "empty_retry_wait": 0,
         "wait_time": 30,  # seconds
     },
     "mistral": {
         "url": "https://chat.mistral.ai/chat/",
+        "driver": "selenium",
+        "selector_type": "xpath",
         "input_selector": "(//textarea)[1]",
         "response_selector": '(//div[contains(@class, "prose")])[last()]',
+        "clear_input": True,
         "wait_time": 20,
     },
     "grok": {
         "url": "https://grok.com/",
         "input_selector": "textarea.w-full.px-2",
         "response_selector": "div.message-bubble.prose",
+        "clear_input": True,
         "wait_time": 25,
     },
     "deepseek": {
@@ -31,19 +53,151 @@ LLM_CONFIGS = {
         "password": os.getenv("DEEPSEEK_PASSWORD"),
         "input_selector": "textarea.c92459f0",
         "response_selector": "div.ds-markdown",
+        "auth_steps": [
+            {
+                "action": "type",
+                "selector": "input[placeholder='Phone number / email address']",
+                "value_key": "email",
+                "wait": True,
+            },
+            {
+                "action": "type",
+                "selector": "input[placeholder='Password']",
+                "value_key": "password",
+            },
+            {"action": "click", "selector": ".ds-checkbox"},
+            {
+                "action": "click",
+                "selector": "div.ds-button.ds-button--primary.ds-button--filled",
+            },
+            {"action": "wait", "selector_key": "input_selector"},
+        ],
         "wait_time_for_logging": 5,
+        "persist_cookies": True,
         "wait_time": 40,
     },
 }
 
 
+def _load_provider_file(path: str) -> Dict:
+    """Load provider definitions from a YAML file, expanding ${ENV} variables."""
+
+    import yaml
+
+    def expand(value):
+        if isinstance(value, str):
+            return os.path.expandvars(value)
+        if isinstance(value, list):
+            return [expand(item) for item in value]
+        if isinstance(value, dict):
+            return {key: expand(item) for key, item in value.items()}
+        return value
+
+    with open(path) as f:
+        return expand(yaml.safe_load(f) or {})
+
+
+def merge_provider_file(configs: Dict, path: str):
+    """Add the providers of a YAML file to `configs`, merging keys over existing ones."""
+
+    for name, config in _load_provider_file(path).items():
+        name = name.strip().lower()
+        configs[name] = {**configs.get(name, {}), **config}
+
+
+# Providers from LLM_PROVIDERS_FILE are added to (or override) the ones above
+if os.getenv("LLM_PROVIDERS_FILE"):
+    merge_provider_file(LLM_CONFIGS, os.getenv("LLM_PROVIDERS_FILE"))
+
+"""Settings for hedged requests (backup attempts for slow providers)."""
+
+HEDGING_CONFIG = {
+    "enabled": os.getenv("LLM_HEDGING_ENABLED", "true").lower() == "true",
+    "percentile": 90,  # launch a backup once an attempt passes this latency percentile
+    "min_samples": 5,  # latency samples needed before a provider can be hedged
+    "window": 50,  # latency samples kept per provider
+    "budget": 0.1,  # max ratio of backup attempts to requests
+}
+
+"""Settings for response evaluation."""
+
+EVALUATOR_CONFIG = {
+    # Use NLTK's word_tokenize (slower) instead of the regex tokenizer for exact parity
+    "use_nltk": os.getenv("EVALUATOR_USE_NLTK", "false").lower() == "true",
+    "token_cache_size": 256,  # tokenized responses kept in memory
+}
+
+"""Settings for the near-duplicate query cache."""
+
+QUERY_CACHE_CONFIG = {
+    "enabled": os.getenv("QUERY_CACHE_ENABLED", "true").lower() == "true",
+    "threshold": 0.7,  # min estimated Jaccard similarity between normalized queries
+    "max_entries": 1000,
+    "path": os.getenv("QUERY_CACHE_PATH", "results/query_cache.json"),
+}
+
+"""Settings for the failure diagnostics (screenshot, DOM snippets, stage timings)."""
+
+DIAGNOSTICS_CONFIG = {
+    "enabled": os.getenv("LLM_DIAGNOSTICS_ENABLED", "false").lower() == "true",
+    "path": os.getenv("LLM_DIAGNOSTICS_PATH", "results/diagnostics"),
+    "max_entries": 50,  # oldest captures are deleted beyond this
+    "max_bytes": 50 * 1024 * 1024,  # or beyond this total size on disk
+    "dom_snippet_chars": 5000,  # max characters kept per DOM snippet
+}
+
+"""Settings for the state shared by multiple API processes."""
+
+SHARED_STATE_CONFIG = {
+    # SQLite file on a local disk, shared by the workers of one host; unset keeps
+    # all state in the process
+    "path": os.getenv("LLM_SHARED_STATE_PATH"),
+    "slot_lease": 600,  # seconds before the slot of a crashed process expires (renewed while held)
+    "max_cache_entries": 1000,  # query cache entries kept in the shared store
+}
+
+
 def get_llm_configs(llm_name: str) -> Dict:
-    """Get the configuration for a given LLM."""
+    """Get the configuration for a given LLM, with provider defaults applied."""
+
+    config = LLM_CONFIGS.get(llm_name)
+    if config is None:
+        return None
 
-    return LLM_CONFIGS.get(llm_name)
+    return {**PROVIDER_DEFAULTS, **config}
 
 
 def get_available_llms() -> List[str]:
     """Get the list of available LLMs."""
 
     return list(LLM_CONFIGS.keys())
+
+
+def get_hedging_config() -> Dict:
+    """Get the settings for hedged requests."""
+
+    return HEDGING_CONFIG
+
+
+def get_evaluator_config() -> Dict:
+    """Get the settings for response evaluation."""
+
+    return EVALUATOR_CONFIG
+
+
+def get_query_cache_config() -> Dict:
+    """Get the settings for the near-duplicate query cache."""
+
+    return QUERY_CACHE_CONFIG
+
+
+def get_diagnostics_config() -> Dict:
+    """Get the settings for the failure diagnostics."""
+
+    return DIAGNOSTICS_CONFIG
+
+
+def get_shared_state_config() -> Dict:
+    """Get the settings for the state shared by multiple API processes."""
+
+    return SHARED_STATE_CONFIG
@@ -3,25 +3,36 @@ import logging
 from datetime import datetime
 from typing import List, Dict, Tuple, Optional
 
-from config.llm_configs import get_llm_configs, get_available_llms
 from core.browser import BrowserAutomation
 from core.evaluator import ResponseEvaluator
+from core.synthesizer import ResponseSynthesizer
+from llms.factory import LLMAutomationFactory
+from llms.registry import provider_registry, register_providers
+from utils.query_cache import QueryCache
 from utils.storage import store_result
 
 logger = logging.getLogger(__name__)
 
 
 class LLMResponseAggregator:
-    def __init__(self, selected_llms=None, headless=True):
+    def __init__(
+        self,
+        selected_llms=None,
+        headless=True,
+        query_cache: Optional[QueryCache] = None,
+    ):
         """
         Initialize the LLM Response Aggregator.
 
         Args:
             selected_llms: List of LLM names to use. If None, use all available LLMs.
             headless: Whether to run browsers in headless mode.
+            query_cache: Cache of past results, reused for near-duplicate queries.
         """
 
-        available_llms = get_available_llms()
+        if not provider_registry.names():
+            register_providers()
+        available_llms = provider_registry.names()
         if selected_llms:
             self.llm_names = [llm for llm in selected_llms if llm in available_llms]
             if not self.llm_names:
@@ -34,11 +45,40 @@ class LLMResponseAggregator:
 
         logger.info(f"Using LLMs: {self.llm_names}")
 
-        self.browser = BrowserAutomation(headless=headless)
+        self.browser = BrowserAutomation(LLMAutomationFactory, headless=headless)
         self.evaluator = ResponseEvaluator()
+        self.synthesizer = ResponseSynthesizer()
+        self.query_cache = query_cache
+
+    async def process_query(self, user_query: str, synthesize: bool = False) -> Dict:
+        """
+        Process a user query through multiple LLMs and return the best response.
+
+        Args:
+            user_query: The query to send to the LLMs.
+            synthesize: Also build a consensus answer from the ranked responses.
+        """
+        if self.query_cache is not None:
+            match = self.query_cache.lookup(user_query, self.llm_names)
+            if match is not None:
+                logger.info(
+                    f"Cache hit for query (similarity={match.similarity:.2f}): {match.matched_query}"
+                )
+                result = {
+                    **match.result,
+                    "original_query": user_query,
+                    "cache": {
+                        "hit": True,
+                        "matched_query": match.matched_query,
+                        "similarity": match.similarity,
+                    },
+                }
+                if synthesize and "synthesized_response" not in result:
+                    result["synthesized_response"] = self.synthesizer.synthesize(
+                        result["all_responses"]
+                    )
+                return result
 
-    async def process_query(self, user_query: str) -> Dict:
-        """Process a user query through multiple LLMs and return the best response."""
         responses = await self._get_all_responses(user_query)
         if not responses:
             return {"error": "Failed to get responses from any LLM"}
@@ -66,17 +106,28 @@ class LLMResponseAggregator:
                 for source, content, score, timestamp in ranked_responses
             ],
         }
+        if synthesize:
+            result["synthesized_response"] = self.synthesizer.synthesize(
+                result["all_responses"]
+            )
 
         filename = store_result(result)
         result["filename"] = filename
 
+        if self.query_cache is not None:
+            # Synthesis is per request, so cache hits only get it when they ask for it
+            cached = {k: v for k, v in result.items() if k != "synthesized_response"}
+            self.query_cache.put(user_query, cached, self.llm_names)
+            result = {**result, "cache": {"hit": False}}
+
         return result
 
     async def _get_all_responses(self, query: str) -> List[Tuple[str, str, datetime]]:
         """Get responses from all configured LLMs asynchronously."""
         tasks = []
         for llm_name in self.llm_names:
-            config = get_llm_configs(llm_name)
+            # The validated config registered at startup, which also sized its limiter
+            config = provider_registry.get(llm_name)
             if not config:
                 logger.warning(f"No configuration found for LLM: {llm_name}")
                 continue
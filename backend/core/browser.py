@@ -1,13 +1,20 @@
 import asyncio
 import logging
+import math
+import threading
+from collections import deque
 from datetime import datetime
-from typing import Dict, Optional, Tuple
+from typing import Deque, Dict, Optional, Tuple
 import time
 from abc import ABC, abstractmethod
 
 from selenium import webdriver
 from selenium.common.exceptions import TimeoutException
 
+from config.llm_configs import get_hedging_config
+from utils.diagnostics import diagnostics_store
+from utils.shared_state import shared_state
+
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +24,11 @@ class LLMBrowserAutomation(ABC):
 
     def __init__(self, headless: bool = True):
         self.headless = headless
+        # Set by cancel(), checked by the run between stages
+        self.cancel_event = threading.Event()
+        # The live browser, kept so cancel() can close it from another thread
+        self._driver = None
+        self._driver_lock = threading.Lock()
 
     def get_chrome_options(self):
         """Get Chrome options for browser."""
@@ -48,38 +60,96 @@ class LLMBrowserAutomation(ABC):
         """Extract the response from the LLM interface."""
         pass
 
+    def wait_for_response(
+        self, driver, config: Dict, cancel_event: threading.Event
+    ) -> bool:
+        """Wait for the LLM to answer. Returns True if the run was cancelled meanwhile."""
+        return cancel_event.wait(config["wait_time"])
+
+    def cancel(self):
+        """
+        Cancel the run, e.g. because a hedged attempt finished first.
+
+        Closing the browser also interrupts a run blocked inside Selenium (page
+        load, WebDriverWait), which then fails fast instead of holding its
+        browser and concurrency slot until Selenium's own timeout.
+        """
+        self.cancel_event.set()
+        driver = self._release_driver()
+        if driver is not None:
+            driver.quit()
+
+    def _release_driver(self):
+        """Take the live browser, so only one of run() and cancel() closes it."""
+        with self._driver_lock:
+            driver, self._driver = self._driver, None
+        return driver
+
     def run(self, config: Dict, query: str) -> Optional[Tuple[str, str, datetime]]:
-        """Run the full automation process."""
+        """
+        Run the full automation process.
+
+        If the automation is cancelled meanwhile, the run stops and returns None.
+        """
+        cancel_event = self.cancel_event
         driver = None
+        # Seconds elapsed at the end of each stage, kept for failure diagnostics
+        timings = {}
+        started = time.monotonic()
         try:
+            # Don't start a browser for an attempt cancelled while it was queued
+            if cancel_event.is_set():
+                return None
+
             # Setup browser
             driver = self.setup_driver(config)
+            with self._driver_lock:
+                self._driver = driver
             # driver.implicitly_wait(10)
+            driver.set_page_load_timeout(config["page_load_timeout"])
+            timings["setup_driver"] = time.monotonic() - started
+            if cancel_event.is_set():
+                return None
 
             # Navigate to LLM website
             driver.get(config["url"])
             logger.info(f"Navigated to {config['url']}")
+            timings["navigate"] = time.monotonic() - started
 
             # Wait for page to load
-            time.sleep(10)
+            if cancel_event.wait(config.get("page_load_wait", 10)):
+                return None
+
+            # Reuse the session of a previous run if cookies are shared
+            self.restore_cookies(driver, config)
 
             # Authenticate if needed
             self.authenticate(driver, config)
+            timings["authenticate"] = time.monotonic() - started
 
             # Input query
             self.input_query(driver, config, query)
             logger.info(f"Sent query to {self.get_name()}")
+            timings["input_query"] = time.monotonic() - started
 
             # Wait for response
             wait_time = config.get("wait_time", 60)
             logger.info(
                 f"Waiting up to {wait_time} seconds for response from {self.get_name()}"
             )
-            time.sleep(config["wait_time"])
+            if self.wait_for_response(driver, config, cancel_event):
+                return None
+            timings["wait_for_response"] = time.monotonic() - started
 
             # Extract response
             response_text = self.extract_response(driver, config)
             timestamp = datetime.now()
+            timings["extract_response"] = time.monotonic() - started
+
+            if not response_text.strip():
+                self._capture_failure(driver, config, query, "empty response", timings)
+            else:
+                self.save_cookies(driver, config)
 
             logger.info(
                 f"Got response from {self.get_name()} ({len(response_text)} chars)"
@@ -87,14 +157,63 @@ class LLMBrowserAutomation(ABC):
             return (self.get_name(), response_text, timestamp)
 
         except TimeoutException:
+            # A cancelled run fails once its browser is closed, which is expected
+            if cancel_event.is_set():
+                return None
             logger.error(f"Timeout while waiting for response from {self.get_name()}")
+            self._capture_failure(driver, config, query, "timeout", timings)
             return None
         except Exception as e:
+            if cancel_event.is_set():
+                return None
             logger.exception(f"Error with {self.get_name()}: {str(e)}")
+            self._capture_failure(driver, config, query, f"error: {str(e)}", timings)
             return None
         finally:
+            driver = self._release_driver()
             if driver:
                 driver.quit()
+            if cancel_event.is_set():
+                logger.info(f"Cancelled attempt for {self.get_name()}")
+
+    def restore_cookies(self, driver, config: Dict):
+        """Load the provider's shared session cookies into the browser, if any."""
+        if shared_state is None or not config.get("persist_cookies"):
+            return
+
+        cookies = shared_state.load_cookies(self.get_name())
+        if not cookies:
+            return
+
+        for cookie in cookies:
+            try:
+                driver.add_cookie(cookie)
+            except Exception as e:
+                logger.warning(f"Skipping cookie for {self.get_name()}: {str(e)}")
+
+        driver.refresh()
+        logger.info(f"Restored {len(cookies)} cookies for {self.get_name()}")
+
+    def save_cookies(self, driver, config: Dict):
+        """Share the provider's session cookies with later runs and other processes."""
+        if shared_state is None or not config.get("persist_cookies"):
+            return
+
+        try:
+            shared_state.save_cookies(self.get_name(), driver.get_cookies())
+        except Exception as e:
+            logger.warning(f"Error saving cookies for {self.get_name()}: {str(e)}")
+
+    def _capture_failure(
+        self, driver, config: Dict, query: str, reason: str, timings: Dict[str, float]
+    ):
+        """Store failure diagnostics for the run, if they are enabled."""
+        if diagnostics_store is None:
+            return
+
+        diagnostics_store.capture(
+            self.get_name(), driver, config, query, reason, timings
+        )
 
     @abstractmethod
     def get_name(self) -> str:
@@ -102,31 +221,207 @@ class LLMBrowserAutomation(ABC):
         pass
 
 
+class LatencyTracker:
+    """Rolling window of successful response latencies per LLM."""
+
+    def __init__(self, window: int = 50):
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, llm_name: str, seconds: float):
+        """Record the latency of a successful attempt."""
+        with self._lock:
+            samples = self._samples.setdefault(llm_name, deque(maxlen=self.window))
+            samples.append(seconds)
+
+    def percentile(
+        self, llm_name: str, percentile: float, min_samples: int = 1
+    ) -> Optional[float]:
+        """Return the latency percentile for the LLM, or None without enough samples."""
+        with self._lock:
+            samples = sorted(self._samples.get(llm_name, ()))
+
+        if not samples or len(samples) < min_samples:
+            return None
+
+        # Nearest-rank percentile
+        rank = max(math.ceil(percentile / 100 * len(samples)), 1)
+        return samples[rank - 1]
+
+
+class HedgeBudget:
+    """Caps backup attempts to a fraction of all requests."""
+
+    def __init__(self, ratio: float = 0.1):
+        self.ratio = ratio
+        self._requests = 0
+        self._hedges = 0
+        self._lock = threading.Lock()
+
+    def record_request(self):
+        """Count a request towards the budget."""
+        with self._lock:
+            self._requests += 1
+
+    def try_acquire(self) -> bool:
+        """Reserve a backup attempt if the budget allows it."""
+        with self._lock:
+            if self._hedges + 1 > self._requests * self.ratio:
+                return False
+            self._hedges += 1
+            return True
+
+
+_hedging_config = get_hedging_config()
+
+# Process-wide: the p90 of a provider and the budget are built up over many requests
+latency_tracker = LatencyTracker(window=_hedging_config["window"])
+hedge_budget = HedgeBudget(ratio=_hedging_config["budget"])
+
+
 class BrowserAutomation:
     """Manager class to handle browser automation for different LLMs."""
 
-    def __init__(self, headless: bool = True):
+    def __init__(self, automation_factory, headless: bool = True):
+        """
+        Initialize the BrowserAutomation class.
+
+        Args:
+            automation_factory: Creates the automation of an LLM and provides its
+                concurrency limiter (see llms.factory.LLMAutomationFactory).
+            headless: Whether to run browsers in headless mode.
+        """
+        self.automation_factory = automation_factory
         self.headless = headless
+        self.hedging_config = get_hedging_config()
 
     async def get_response(
         self, llm_name: str, config: Dict, query: str
     ) -> Optional[Tuple[str, str, datetime]]:
         """
         Get the response from the LLM
+
+        Once an attempt runs past the LLM's observed latency percentile, a backup
+        attempt is launched (within the hedge budget) and whichever one returns
+        a response first wins; the other one is cancelled and its browser closed.
+
         :param llm_name: str: The name of the LLM
         :param config: Dict: The configuration for the LLM
         :param query: str: The query to send to the LLM
         :return: Tuple of (llm_name, response_text, timestamp) if successful, None otherwise.
         """
-        return await asyncio.to_thread(
-            self._run_browser_automation, llm_name, config, query
+        hedge_after = self._get_hedge_delay(llm_name, config)
+        hedge_budget.record_request()
+
+        primary_automation = self.automation_factory.create_automation(
+            llm_name, self.headless
+        )
+        primary = asyncio.create_task(
+            self._run_attempt(llm_name, primary_automation, config, query)
+        )
+        if hedge_after is None:
+            return await primary
+
+        done, _ = await asyncio.wait({primary}, timeout=hedge_after)
+        if primary in done:
+            return primary.result()
+
+        if not hedge_budget.try_acquire():
+            logger.info(f"Hedge budget exhausted, not hedging {llm_name}")
+            return await primary
+
+        logger.info(
+            f"{llm_name} exceeded p{self.hedging_config['percentile']} "
+            f"({hedge_after:.1f}s), launching backup attempt"
         )
+        backup_automation = self.automation_factory.create_automation(
+            llm_name, self.headless
+        )
+        backup = asyncio.create_task(
+            self._run_attempt(llm_name, backup_automation, config, query)
+        )
+        return await self._first_response(
+            {primary: primary_automation, backup: backup_automation}
+        )
+
+    def _get_hedge_delay(self, llm_name: str, config: Dict) -> Optional[float]:
+        """Return how long to wait before hedging the LLM, or None to not hedge."""
+        if not self.hedging_config["enabled"] or not config.get("hedge", True):
+            return None
+
+        return latency_tracker.percentile(
+            llm_name,
+            self.hedging_config["percentile"],
+            self.hedging_config["min_samples"],
+        )
+
+    @staticmethod
+    async def _first_response(
+        attempts: Dict[asyncio.Task, LLMBrowserAutomation],
+    ) -> Optional[Tuple[str, str, datetime]]:
+        """Wait for the first attempt that returns a response and cancel the rest."""
+        pending = set(attempts)
+        result = None
+        error = None
+        try:
+            while pending and result is None:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is not None:
+                        error = task.exception()
+                    elif task.result() is not None:
+                        result = task.result()
+                        break
+        finally:
+            loop = asyncio.get_running_loop()
+            for task in pending:
+                # Closing a browser blocks, so don't hold up the winner's response
+                loop.run_in_executor(None, attempts[task].cancel)
+
+        if result is None and error is not None:
+            raise error
+        return result
+
+    async def _run_attempt(
+        self,
+        llm_name: str,
+        automation: LLMBrowserAutomation,
+        config: Dict,
+        query: str,
+    ) -> Optional[Tuple[str, str, datetime]]:
+        """Run one browser attempt in a worker thread and record its latency."""
+        started = time.monotonic()
+        result = await asyncio.to_thread(
+            self._run_browser_automation, llm_name, automation, config, query
+        )
+        if result is not None and not automation.cancel_event.is_set():
+            latency_tracker.record(llm_name, time.monotonic() - started)
+        return result
 
     def _run_browser_automation(
-        self, llm_name: str, config: Dict, query: str
+        self,
+        llm_name: str,
+        automation: LLMBrowserAutomation,
+        config: Dict,
+        query: str,
     ) -> Optional[Tuple[str, str, datetime]]:
         """Run browser automation for the specified LLM."""
-        from llms.factory import LLMAutomationFactory
+        max_concurrency = config.get("max_concurrency")
+        if shared_state is not None and max_concurrency:
+            # Limit concurrent browsers across every process sharing the state
+            with shared_state.provider_slot(
+                llm_name, max_concurrency, automation.cancel_event
+            ) as acquired:
+                if not acquired:
+                    return None
+                return automation.run(config, query)
+
+        limiter = self.automation_factory.get_limiter(llm_name)
+        if limiter is None:
+            return automation.run(config, query)
 
-        automation = LLMAutomationFactory.create_automation(llm_name, self.headless)
-        return automation.run(config, query)
+        with limiter:
+            return automation.run(config, query)
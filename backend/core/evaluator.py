@@ -1,27 +1,124 @@
+import hashlib
 import logging
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 import nltk
 from nltk.tokenize import word_tokenize
 from nltk.corpus import stopwords
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
-from typing import List, Dict, Tuple
+from typing import FrozenSet, List, NamedTuple, Optional, Tuple
 from datetime import datetime
 
+from config.llm_configs import get_evaluator_config
+
 
 logger = logging.getLogger(__name__)
 
+# Close to word_tokenize: words (keeping inner apostrophes/hyphens) and punctuation
+TOKEN_PATTERN = re.compile(r"\w+(?:['’-]\w+)*|[^\w\s]")
+# The token pattern TfidfVectorizer uses by default
+TFIDF_TOKEN_PATTERN = re.compile(r"(?u)\b\w\w+\b")
+
+
+class TokenizedText(NamedTuple):
+    """Tokens of a text, shared by the relevance, TF-IDF and length scores."""
+
+    tokens: FrozenSet[str]  # lowercased tokens without stop words
+    tfidf_terms: Tuple[str, ...]
+    word_count: int
+
+
+class TokenCache:
+    """LRU cache of tokenized texts keyed by a hash of their content."""
+
+    def __init__(self, max_size: int = 256):
+        self.max_size = max_size
+        self._entries: "OrderedDict[bytes, TokenizedText]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(text: str, use_nltk: bool) -> bytes:
+        digest = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16)
+        digest.update(b"nltk" if use_nltk else b"regex")
+        return digest.digest()
+
+    def get(self, key: bytes) -> Optional[TokenizedText]:
+        with self._lock:
+            tokenized = self._entries.get(key)
+            if tokenized is not None:
+                self._entries.move_to_end(key)
+            return tokenized
+
+    def put(self, key: bytes, tokenized: TokenizedText):
+        with self._lock:
+            self._entries[key] = tokenized
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+
+@lru_cache(maxsize=1)
+def load_stop_words() -> FrozenSet[str]:
+    """Download the NLTK resources (once per process) and return the stop words."""
+    try:
+        nltk.download("punkt", quiet=True)
+        nltk.download("stopwords", quiet=True)
+    except Exception as e:
+        logger.error(f"Failed to download NLTK resources: {str(e)}")
+
+    return frozenset(stopwords.words("english"))
+
+
+# Outlives each ResponseEvaluator, so texts repeated across requests are tokenized once
+token_cache = TokenCache(max_size=get_evaluator_config()["token_cache_size"])
+
 
 class ResponseEvaluator:
-    def __init__(self):
-        """Initialize the ResponseEvaluator class."""
-        try:
-            nltk.download("punkt", quiet=True)
-            nltk.download("stopwords", quiet=True)
-        except Exception as e:
-            logger.error(f"Failed to download NLTK resources: {str(e)}")
+    def __init__(self, use_nltk: Optional[bool] = None):
+        """
+        Initialize the ResponseEvaluator class.
+
+        Args:
+            use_nltk: Tokenize with NLTK's word_tokenize instead of the faster
+                regex tokenizer. Defaults to EVALUATOR_CONFIG["use_nltk"].
+        """
+        self.use_nltk = (
+            get_evaluator_config()["use_nltk"] if use_nltk is None else use_nltk
+        )
+        self.stop_words = load_stop_words()
+        self.vectorizer = TfidfVectorizer(analyzer=self._tfidf_terms)
+
+    def tokenize(self, text: str) -> TokenizedText:
+        """Tokenize a text, reusing the cached result for previously seen content."""
+        key = TokenCache.key(text, self.use_nltk)
+        tokenized = token_cache.get(key)
+        if tokenized is None:
+            tokenized = self._tokenize(text)
+            token_cache.put(key, tokenized)
+        return tokenized
+
+    def _tokenize(self, text: str) -> TokenizedText:
+        lowered = text.lower()
+        if self.use_nltk:
+            try:
+                tokens = word_tokenize(lowered)
+            except Exception as e:
+                logger.warning(f"Error tokenizing text: {str(e)}")
+                tokens = lowered.split()
+        else:
+            tokens = TOKEN_PATTERN.findall(lowered)
 
-        self.stop_words = set(stopwords.words("english"))
-        self.vectorizer = TfidfVectorizer()
+        return TokenizedText(
+            tokens=frozenset(tokens) - self.stop_words,
+            tfidf_terms=tuple(TFIDF_TOKEN_PATTERN.findall(lowered)),
+            word_count=len(text.split()),
+        )
+
+    def _tfidf_terms(self, text: str) -> Tuple[str, ...]:
+        return self.tokenize(text).tfidf_terms
 
     def evaluate_and_rank_responses(
         self, query: str, responses: List[Tuple[str, str, datetime]]
@@ -54,23 +151,15 @@ class ResponseEvaluator:
             ]
 
         # Calculate relevance to query
-        try:
-            query_tokens = set(word_tokenize(query.lower())) - self.stop_words
-        except Exception as e:
-            logger.warning(f"Error tokenizing query: {str(e)}")
-            query_tokens = set(query.lower().split())
+        query_tokens = self.tokenize(query).tokens
 
         scored_responses = []
         for i, (source, content, timestamp) in enumerate(responses):
-            try:
-                content_tokens = set(word_tokenize(content.lower())) - self.stop_words
-            except Exception as e:
-                logger.warning(f"Error tokenizing response: {str(e)}")
-                content_tokens = set(content.lower().split())
+            tokenized = self.tokenize(content)
 
             # calculate relevance score
             relevance_score = (
-                len(query_tokens.intersection(content_tokens)) / len(query_tokens)
+                len(query_tokens.intersection(tokenized.tokens)) / len(query_tokens)
                 if query_tokens
                 else 0
             )
@@ -79,7 +168,7 @@ class ResponseEvaluator:
             cross_check_score = sum(similarities[i]) / len(responses)
 
             # Calculate length score (penalize very short responses, reward medium-length ones)
-            word_count = len(content.split())
+            word_count = tokenized.word_count
             if word_count < 50:
                 length_score = word_count / 50
             elif word_count < 500:
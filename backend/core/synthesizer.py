@@ -0,0 +1,128 @@
+import logging
+import re
+from typing import Dict, Iterator, List
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+
+logger = logging.getLogger(__name__)
+
+# Sentence ends, plus line breaks since responses often contain lists and code
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+|\n+")
+
+
+class ResponseSynthesizer:
+    def __init__(
+        self,
+        similarity_threshold: float = 0.5,
+        min_sentence_words: int = 4,
+        max_sentences: int = 15,
+    ):
+        """
+        Initialize the ResponseSynthesizer class.
+
+        Args:
+            similarity_threshold: Min cosine similarity for two sentences to agree.
+            min_sentence_words: Shorter sentences (headings, code) are ignored.
+            max_sentences: Max sentences in the synthesized answer.
+        """
+        self.similarity_threshold = similarity_threshold
+        self.min_sentence_words = min_sentence_words
+        self.max_sentences = max_sentences
+
+    def segment(self, text: str) -> List[str]:
+        """Split a response into sentences, dropping fragments."""
+        return [
+            sentence.strip()
+            for sentence in SENTENCE_BOUNDARY.split(text)
+            if len(sentence.split()) >= self.min_sentence_words
+        ]
+
+    def synthesize(self, responses: List[Dict]) -> Dict:
+        """
+        Build a consensus answer from ranked responses.
+        Args:
+            responses: Ranked responses as dicts with source, content and score.
+
+        Returns:
+            Dict with the synthesized content and its sentences with provenance.
+        """
+        sentences = list(self.synthesize_stream(responses))
+        return {
+            "content": " ".join(sentence["text"] for sentence in sentences),
+            "sentences": sentences,
+        }
+
+    def synthesize_stream(self, responses: List[Dict]) -> Iterator[Dict]:
+        """
+        Yield the consensus sentences one at a time, in answer order.
+
+        Sentences of all responses are vectorized together and each one is
+        clustered with its most similar sentence from every other response. The
+        `max_sentences` clusters backed by the most providers (ties going to the
+        best-ranked response) are kept, and yielded in the order they appear in
+        the ranked responses. The sentence of the best-ranked response represents
+        its cluster. With fewer than two responses there is nothing to agree on.
+        """
+        if len(responses) < 2:
+            return
+
+        segmented = [
+            (rank, position, sentence)
+            for rank, response in enumerate(responses)
+            for position, sentence in enumerate(self.segment(response["content"]))
+        ]
+        if not segmented:
+            return
+
+        try:
+            matrix = TfidfVectorizer().fit_transform(
+                [sentence for _, _, sentence in segmented]
+            )
+            # Rows are L2-normalized, so the dot product is the cosine similarity
+            similarities = (matrix @ matrix.T).toarray()
+        except ValueError as e:
+            logger.warning(f"Error vectorizing sentences: {str(e)}")
+            return
+
+        clusters = [
+            cluster
+            for cluster in self._clusters(segmented, similarities)
+            if len(cluster) >= 2
+        ]
+        # Highest agreement first, then the best-ranked response, then answer order
+        selected = sorted(clusters, key=lambda cluster: (-len(cluster), cluster[0]))
+        for cluster in sorted(selected[: self.max_sentences], key=lambda cluster: cluster[0]):
+            rank, _, text = segmented[cluster[0]]
+            yield {
+                "text": text,
+                "source": responses[rank]["source"],
+                "agreement": len(cluster) / len(responses),
+                "supported_by": [
+                    {
+                        "source": responses[segmented[i][0]]["source"],
+                        "sentence": segmented[i][2],
+                        "similarity": float(similarities[cluster[0]][i]),
+                    }
+                    for i in cluster[1:]
+                ],
+            }
+
+    def _clusters(self, segmented: List, similarities: np.ndarray) -> Iterator[List[int]]:
+        """Greedily group each sentence with its best match from every other response."""
+        ranks = np.array([rank for rank, _, _ in segmented])
+        available = np.ones(len(segmented), dtype=bool)
+        for i in range(len(segmented)):
+            if not available[i]:
+                continue
+
+            row = np.where(available & (ranks != ranks[i]), similarities[i], 0.0)
+            cluster = [i]
+            for other_rank in np.unique(ranks[row >= self.similarity_threshold]):
+                cluster.append(int(np.where(ranks == other_rank, row, 0.0).argmax()))
+
+            available[cluster] = False
+            # Absorb repeats of the sentence so it is not emitted twice
+            available[similarities[i] >= self.similarity_threshold] = False
+            yield cluster
@@ -1,6 +1,11 @@
 """Factory for creating LLM automation instances."""
 
+import threading
+from typing import Optional
+
 from core.browser import LLMBrowserAutomation
+from llms.generic_automation import GenericLLMAutomation
+from llms.registry import provider_registry, register_providers
 
 
 class LLMAutomationFactory:
@@ -8,23 +13,17 @@ class LLMAutomationFactory:
 
     @staticmethod
     def create_automation(llm_name: str, headless: bool = True) -> LLMBrowserAutomation:
-        """Create an appropriate LLM automation instance based on the LLM name."""
+        """Create an automation instance for a registered LLM provider."""
         llm_name = llm_name.strip().lower()
 
-        if llm_name == "chatgpt":
-            from llms.chatGPT_automation import ChatGPTAutomation
-
-            return ChatGPTAutomation(headless)
-        elif llm_name == "deepseek":
-            from llms.deepSeek_automation import DeepSeekAutomation
-
-            return DeepSeekAutomation(headless)
+        if not provider_registry.names():
+            register_providers()
+        if provider_registry.get(llm_name) is None:
+            raise ValueError(f"Unknown LLM provider: {llm_name}")
 
-        elif llm_name == "mistral":
-            from llms.mistral_automation import MistralAutomation
+        return GenericLLMAutomation(llm_name, headless)
 
-            return MistralAutomation(llm_name, headless)
-        elif llm_name == "grok":
-            from llms.grok_automation import GrokAutomation
-
-            return GrokAutomation(llm_name, headless)
+    @staticmethod
+    def get_limiter(llm_name: str) -> Optional[threading.BoundedSemaphore]:
+        """Get the in-process concurrency limiter of an LLM provider, if it has one."""
+        return provider_registry.get_limiter(llm_name)
@@ -0,0 +1,151 @@
+"""Generic browser automation driven by the provider configuration."""
+
+from typing import Dict, List
+import logging
+import threading
+import time
+
+import undetected_chromedriver as uc
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.common.action_chains import ActionChains
+from webdriver_manager.chrome import ChromeDriverManager
+from selenium.webdriver.chrome.service import Service
+
+from core.browser import LLMBrowserAutomation
+
+logger = logging.getLogger(__name__)
+
+
+SELECTOR_TYPES = {"css": By.CSS_SELECTOR, "xpath": By.XPATH}
+DRIVERS = {"undetected": uc.Chrome, "selenium": webdriver.Chrome}
+
+# Login steps in "auth_steps" are dicts with an "action" and a selector, given
+# either literally ("selector") or as a key of the provider config ("selector_key"):
+#   {"action": "type", "selector": ..., "value_key": "email", "wait": True}
+#   {"action": "click", "selector": ...}
+#   {"action": "wait", "selector": ...}
+AUTH_ACTIONS = {"type", "click", "wait"}
+
+
+class GenericLLMAutomation(LLMBrowserAutomation):
+    """Browser automation for any LLM described by a provider configuration."""
+
+    def __init__(self, llm_name: str, headless: bool = True):
+        super().__init__(headless)
+        self.llm_name = llm_name
+
+    def get_name(self) -> str:
+        return self.llm_name
+
+    def setup_driver(self, config: Dict):
+        logger.info(f"Starting browser for {self.get_name()}")
+        service = Service(ChromeDriverManager().install())
+        return DRIVERS[config["driver"]](
+            service=service, options=self.get_chrome_options()
+        )
+
+    def authenticate(self, driver, config: Dict):
+        if not config["auth_steps"]:
+            return
+
+        # Wait for the page to render either the chat input (already logged in,
+        # e.g. with restored session cookies) or the first login field
+        by = SELECTOR_TYPES[config["selector_type"]]
+        first_step = config["auth_steps"][0]
+        WebDriverWait(driver, config["wait_time_for_logging"]).until(
+            EC.any_of(
+                EC.presence_of_element_located((by, config["input_selector"])),
+                EC.presence_of_element_located(
+                    (by, first_step.get("selector") or config[first_step["selector_key"]])
+                ),
+            )
+        )
+        if driver.find_elements(by, config["input_selector"]):
+            logger.info(f"Already authenticated with {self.get_name()}")
+            return
+
+        for step in config["auth_steps"]:
+            self._run_auth_step(driver, config, step)
+
+    def input_query(self, driver, config: Dict, query: str):
+        by = SELECTOR_TYPES[config["selector_type"]]
+        WebDriverWait(driver, config["wait_time"]).until(
+            EC.element_to_be_clickable((by, config["input_selector"]))
+        )
+
+        input_field = driver.find_element(by, config["input_selector"])
+        if config["focus_input"]:
+            ActionChains(driver).move_to_element(input_field).click().perform()
+        if config["clear_input"]:
+            try:
+                input_field.clear()
+            except Exception:
+                # If clear fails, just continue
+                pass
+
+        input_field.send_keys(query)
+        input_field.send_keys(Keys.RETURN)
+
+    def wait_for_response(
+        self, driver, config: Dict, cancel_event: threading.Event
+    ) -> bool:
+        if not config["completion_selector"]:
+            return super().wait_for_response(driver, config, cancel_event)
+
+        # Poll for the completion marker instead of always waiting the full wait_time
+        by = SELECTOR_TYPES[config["selector_type"]]
+        deadline = time.monotonic() + config["wait_time"]
+        while time.monotonic() < deadline:
+            if driver.find_elements(by, config["completion_selector"]):
+                return False
+            if cancel_event.wait(1):
+                return True
+
+        logger.warning(f"Completion marker not seen for {self.get_name()}")
+        return cancel_event.is_set()
+
+    def extract_response(self, driver, config: Dict) -> str:
+        response_text = self._read_last_response(driver, config)
+        if response_text is None:
+            logger.warning(f"No response elements found for {self.get_name()}")
+            return ""
+
+        # If response is empty, wait and try again
+        if not response_text.strip():
+            logger.info("Empty response, waiting longer...")
+            time.sleep(config["empty_retry_wait"])
+            response_text = self._read_last_response(driver, config) or response_text
+
+        return response_text
+
+    def _read_last_response(self, driver, config: Dict):
+        """Return the text of the most recent response element, or None if absent."""
+        response_elements: List = driver.find_elements(
+            SELECTOR_TYPES[config["selector_type"]], config["response_selector"]
+        )
+        if not response_elements:
+            return None
+
+        return response_elements[-1].text
+
+    def _run_auth_step(self, driver, config: Dict, step: Dict):
+        """Run a single login step from the provider configuration."""
+        by = SELECTOR_TYPES[config["selector_type"]]
+        selector = step.get("selector") or config[step["selector_key"]]
+        action = step["action"]
+
+        if action == "wait" or step.get("wait"):
+            element = WebDriverWait(driver, config["wait_time_for_logging"]).until(
+                EC.presence_of_element_located((by, selector))
+            )
+        else:
+            element = driver.find_element(by, selector)
+
+        if action == "type":
+            element.send_keys(config[step["value_key"]])
+        elif action == "click":
+            ActionChains(driver).move_to_element(element).click().perform()
@@ -0,0 +1,76 @@
+"""Registry of the LLM providers described in the configuration."""
+
+import logging
+import threading
+from typing import Dict, List, Optional
+
+from config.llm_configs import get_available_llms, get_llm_configs
+from llms.generic_automation import AUTH_ACTIONS, DRIVERS, SELECTOR_TYPES
+
+logger = logging.getLogger(__name__)
+
+REQUIRED_KEYS = ("url", "input_selector", "response_selector", "wait_time")
+
+
+class ProviderRegistry:
+    """Validated provider configurations and their per-provider concurrency limits."""
+
+    def __init__(self):
+        self._providers: Dict[str, Dict] = {}
+        self._limiters: Dict[str, threading.BoundedSemaphore] = {}
+
+    def register(self, llm_name: str, config: Dict):
+        """Validate and register a provider configuration."""
+        llm_name = llm_name.strip().lower()
+
+        missing = [key for key in REQUIRED_KEYS if not config.get(key)]
+        if missing:
+            raise ValueError(f"Provider {llm_name} is missing {missing}")
+        if config["selector_type"] not in SELECTOR_TYPES:
+            raise ValueError(
+                f"Provider {llm_name} has unknown selector_type {config['selector_type']}"
+            )
+        if config["driver"] not in DRIVERS:
+            raise ValueError(f"Provider {llm_name} has unknown driver {config['driver']}")
+        for step in config["auth_steps"]:
+            if step.get("action") not in AUTH_ACTIONS:
+                raise ValueError(
+                    f"Provider {llm_name} has unknown auth action {step.get('action')}"
+                )
+            if not step.get("selector") and step.get("selector_key") not in config:
+                raise ValueError(f"Provider {llm_name} has an auth step without selector")
+            if step["action"] == "type" and step.get("value_key") not in config:
+                raise ValueError(
+                    f"Provider {llm_name} has a type step without value_key in its config"
+                )
+
+        self._providers[llm_name] = config
+        if config["max_concurrency"]:
+            self._limiters[llm_name] = threading.BoundedSemaphore(
+                config["max_concurrency"]
+            )
+        else:
+            self._limiters.pop(llm_name, None)
+
+    def get(self, llm_name: str) -> Optional[Dict]:
+        """Get the configuration of a registered provider."""
+        return self._providers.get(llm_name.strip().lower())
+
+    def get_limiter(self, llm_name: str) -> Optional[threading.BoundedSemaphore]:
+        """Get the concurrency limiter of a provider, if it has one."""
+        return self._limiters.get(llm_name.strip().lower())
+
+    def names(self) -> List[str]:
+        """Get the names of the registered providers."""
+        return list(self._providers)
+
+
+provider_registry = ProviderRegistry()
+
+
+def register_providers():
+    """Register every configured provider. Called once at startup."""
+    for llm_name in get_available_llms():
+        provider_registry.register(llm_name, get_llm_configs(llm_name))
+
+    logger.info(f"Registered LLM providers: {provider_registry.names()}")
@@ -1,11 +1,18 @@
+import json
 import logging
 from datetime import datetime
 from pydantic import BaseModel
 
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import FileResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 
+from config.llm_configs import get_query_cache_config
 from core.aggregator import LLMResponseAggregator
+from llms.registry import register_providers
+from utils.diagnostics import diagnostics_store
+from utils.query_cache import QueryCache
+from utils.shared_state import shared_state
 
 # Set up logging
 logging.basicConfig(
@@ -19,6 +26,23 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# Validate and register the configured LLM providers once, at startup
+register_providers()
+
+# Near-duplicate query cache shared by all requests (and all processes with shared state)
+query_cache_config = get_query_cache_config()
+query_cache = None
+if query_cache_config["enabled"]:
+    query_cache = QueryCache(
+        threshold=query_cache_config["threshold"],
+        max_entries=query_cache_config["max_entries"],
+        shared_state=shared_state,
+    )
+    if shared_state is None:
+        query_cache.load(query_cache_config["path"])
+    else:
+        query_cache.sync()
+
 # Initialize FastAPI app
 app = FastAPI()
 
@@ -37,6 +61,8 @@ class QueryRequest(BaseModel):
     query: str
     llms: list[str] = ["chatgpt", "deepseek", "grok", "mistral"]
     headless: bool = True
+    use_cache: bool = True
+    synthesize: bool = False
 
 
 @app.post("/aggregate")
@@ -44,11 +70,15 @@ async def aggregate_responses(request: QueryRequest):
     """Endpoint to aggregate responses from multiple LLMs."""
     logger.info(f"Processing query: {request.query}")
     aggregator = LLMResponseAggregator(
-        selected_llms=request.llms, headless=request.headless
+        selected_llms=request.llms,
+        headless=request.headless,
+        query_cache=query_cache if request.use_cache else None,
     )
 
     try:
-        result = await aggregator.process_query(request.query)
+        result = await aggregator.process_query(
+            request.query, synthesize=request.synthesize
+        )
         if "error" in result:
             logger.error(f"Error: {result['error']}")
             raise HTTPException(status_code=500, detail=result["error"])
@@ -60,4 +90,73 @@ async def aggregate_responses(request: QueryRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/aggregate/stream")
+async def aggregate_responses_stream(request: QueryRequest):
+    """
+    Endpoint to aggregate responses and stream the synthesized answer.
+
+    Streams newline-delimited JSON: the ranked result first, then one line per
+    consensus sentence (with its provenance) in answer order. Nothing is sent
+    until every LLM has answered and the responses are ranked.
+    """
+    logger.info(f"Processing streamed query: {request.query}")
+    aggregator = LLMResponseAggregator(
+        selected_llms=request.llms,
+        headless=request.headless,
+        query_cache=query_cache if request.use_cache else None,
+    )
+
+    result = await aggregator.process_query(request.query)
+    if "error" in result:
+        logger.error(f"Error: {result['error']}")
+        raise HTTPException(status_code=500, detail=result["error"])
+
+    def stream():
+        yield json.dumps({"type": "result", "result": result}, default=str) + "\n"
+        for sentence in aggregator.synthesizer.synthesize_stream(
+            result["all_responses"]
+        ):
+            yield json.dumps({"type": "sentence", **sentence}) + "\n"
+        yield json.dumps({"type": "done"}) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+@app.get("/diagnostics")
+async def list_diagnostics():
+    """List the stored failure diagnostics, newest first."""
+    if diagnostics_store is None:
+        raise HTTPException(status_code=404, detail="Diagnostics are disabled")
+
+    return diagnostics_store.list()
+
+
+@app.get("/diagnostics/{capture_id}")
+async def get_diagnostics(capture_id: str):
+    """Get a stored failure capture with its DOM snippets and stage timings."""
+    capture = diagnostics_store.get(capture_id) if diagnostics_store else None
+    if capture is None:
+        raise HTTPException(status_code=404, detail="Capture not found")
+
+    return capture
+
+
+@app.get("/diagnostics/{capture_id}/screenshot")
+async def get_diagnostics_screenshot(capture_id: str):
+    """Get the screenshot of a stored failure capture."""
+    path = diagnostics_store.screenshot_path(capture_id) if diagnostics_store else None
+    if path is None:
+        raise HTTPException(status_code=404, detail="Screenshot not found")
+
+    return FileResponse(path, media_type="image/png")
+
+
+@app.on_event("shutdown")
+def save_query_cache():
+    """Persist the query cache so it survives restarts."""
+    # The shared state store is already persistent
+    if query_cache is not None and shared_state is None:
+        query_cache.save(query_cache_config["path"])
+
+
 # To run the FastAPI app, use: `uvicorn main:app --host 0.0.0.0 --port 8000`
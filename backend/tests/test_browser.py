@@ -0,0 +1,201 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+import core.browser
+from core.browser import BrowserAutomation, HedgeBudget, LatencyTracker, LLMBrowserAutomation
+
+
+CONFIG = {
+    "url": "https://example.com/",
+    "wait_time": 0,
+    "page_load_wait": 0,
+    "page_load_timeout": 5,
+    "max_concurrency": None,
+}
+
+
+class FakeDriver:
+    def __init__(self, stall: bool):
+        self.stall = stall
+        self.closed = threading.Event()
+
+    def set_page_load_timeout(self, seconds):
+        pass
+
+    def get(self, url):
+        # A stalled page load only ends when the browser is closed
+        if self.stall and self.closed.wait(5):
+            raise WebDriverException("session deleted")
+
+    def quit(self):
+        self.closed.set()
+
+
+class FakeAutomation(LLMBrowserAutomation):
+    def __init__(self, name: str, stall: bool = False):
+        super().__init__()
+        self.name = name
+        self.driver = FakeDriver(stall)
+        self.finished = threading.Event()
+
+    def get_name(self):
+        return self.name
+
+    def setup_driver(self, config):
+        return self.driver
+
+    def authenticate(self, driver, config):
+        pass
+
+    def input_query(self, driver, config, query):
+        pass
+
+    def extract_response(self, driver, config):
+        return f"answer from {self.name}"
+
+    def run(self, config, query):
+        try:
+            return super().run(config, query)
+        finally:
+            self.finished.set()
+
+
+class FakeFactory:
+    def __init__(self, automations):
+        self.automations = list(automations)
+
+    def create_automation(self, llm_name, headless=True):
+        return self.automations.pop(0)
+
+    def get_limiter(self, llm_name):
+        return None
+
+
+class FakeAttempt:
+    def __init__(self):
+        self.cancelled = threading.Event()
+
+    def cancel(self):
+        self.cancelled.set()
+
+
+async def returns(value, delay=0.0):
+    await asyncio.sleep(delay)
+    return value
+
+
+async def raises(error):
+    raise error
+
+
+def test_latency_percentile_needs_min_samples():
+    tracker = LatencyTracker()
+    for seconds in range(1, 5):
+        tracker.record("grok", seconds)
+
+    assert tracker.percentile("grok", 90, min_samples=5) is None
+    assert tracker.percentile("mistral", 90) is None
+
+    tracker.record("grok", 5)
+    assert tracker.percentile("grok", 90, min_samples=5) == 5
+
+
+def test_latency_percentile_is_nearest_rank_over_window():
+    tracker = LatencyTracker(window=10)
+    for seconds in range(100, 110):
+        tracker.record("grok", 1000)
+        tracker.record("grok", seconds)
+    for seconds in range(1, 11):
+        tracker.record("grok", seconds)
+
+    assert tracker.percentile("grok", 90) == 9
+    assert tracker.percentile("grok", 50) == 5
+
+
+def test_hedge_budget_caps_backups():
+    budget = HedgeBudget(ratio=0.1)
+    assert not budget.try_acquire()
+
+    for _ in range(10):
+        budget.record_request()
+
+    assert budget.try_acquire()
+    assert not budget.try_acquire()
+
+
+def test_first_response_cancels_the_loser():
+    async def run():
+        winner, loser = FakeAttempt(), FakeAttempt()
+        result = await BrowserAutomation._first_response(
+            {
+                asyncio.create_task(returns("fast")): winner,
+                asyncio.create_task(returns("slow", delay=5)): loser,
+            }
+        )
+        return result, winner, loser
+
+    result, winner, loser = asyncio.run(run())
+
+    assert result == "fast"
+    assert loser.cancelled.wait(1)
+    assert not winner.cancelled.is_set()
+
+
+def test_first_response_skips_failed_attempts():
+    async def run():
+        return await BrowserAutomation._first_response(
+            {
+                asyncio.create_task(returns(None)): FakeAttempt(),
+                asyncio.create_task(returns("backup", delay=0.05)): FakeAttempt(),
+            }
+        )
+
+    assert asyncio.run(run()) == "backup"
+
+
+def test_first_response_raises_when_no_attempt_succeeds():
+    async def run():
+        return await BrowserAutomation._first_response(
+            {
+                asyncio.create_task(raises(RuntimeError("boom"))): FakeAttempt(),
+                asyncio.create_task(returns(None)): FakeAttempt(),
+            }
+        )
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(run())
+
+
+def test_hedged_backup_wins_and_closes_the_stalled_browser(monkeypatch):
+    tracker = LatencyTracker()
+    for _ in range(5):
+        tracker.record("grok", 0.05)
+    monkeypatch.setattr(core.browser, "latency_tracker", tracker)
+    monkeypatch.setattr(core.browser, "hedge_budget", HedgeBudget(ratio=1.0))
+
+    primary = FakeAutomation("grok", stall=True)
+    backup = FakeAutomation("grok")
+    browser = BrowserAutomation(FakeFactory([primary, backup]))
+    browser.hedging_config = {**browser.hedging_config, "enabled": True}
+
+    started = time.monotonic()
+    result = asyncio.run(browser.get_response("grok", CONFIG, "query"))
+
+    assert result[:2] == ("grok", "answer from grok")
+    assert primary.cancel_event.is_set()
+    # The stalled page load is interrupted instead of running into its timeout
+    assert primary.finished.wait(1)
+    assert primary.driver.closed.is_set()
+    assert time.monotonic() - started < 2
+
+
+def test_attempt_cancelled_while_queued_starts_no_browser():
+    automation = FakeAutomation("grok")
+    automation.cancel()
+
+    assert automation.run(CONFIG, "query") is None
+    assert not automation.driver.closed.is_set()
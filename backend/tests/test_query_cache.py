@@ -0,0 +1,106 @@
+import pytest
+
+import time
+
+from utils.query_cache import QueryCache, exact_terms, normalize_query
+
+
+@pytest.mark.parametrize(
+    "cached, query",
+    [
+        ("what is 2+2", "what is 2+3"),
+        ("How tall is Mount Everest in meters?", "How tall is Mount Everest in feet?"),
+        ("Is it safe to eat raw eggs?", "Is it not safe to eat raw eggs?"),
+        ("Explain quicksort in C++", "Explain quicksort in C#"),
+        ("How do I reverse a list in Python?", "How do I sort a list in Python?"),
+        ("How do I reverse a list in Python?", "How do I reverse a list in Java?"),
+        ("What is the capital of France?", "What is the capital of Germany?"),
+    ],
+)
+def test_different_questions_do_not_match(cached, query):
+    cache = QueryCache()
+    cache.put(cached, {"answer": cached})
+
+    assert cache.lookup(query) is None
+
+
+@pytest.mark.parametrize(
+    "cached, query",
+    [
+        ("Explain quicksort in C++", "explain   quicksort in c++?"),
+        ("What is 2+2?", "what is 2+2"),
+        ("How tall is Mount Everest in meters?", "how tall is mount everest, in meters"),
+        ("Can you explain quantum computing?", "Please explain quantum computing"),
+    ],
+)
+def test_same_question_matches(cached, query):
+    cache = QueryCache()
+    cache.put(cached, {"answer": cached})
+
+    match = cache.lookup(query)
+
+    assert match is not None
+    assert match.matched_query == cached
+    assert match.result == {"answer": cached}
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "How to reverse a list in Python",
+        "how do i reverse a python list",
+        "How can I reverse lists in Python?",
+        "Reverse a list in Python",
+    ],
+)
+def test_paraphrase_matches(query):
+    cache = QueryCache()
+    cache.put("How do I reverse a list in Python?", {"answer": 1})
+
+    match = cache.lookup(query)
+
+    assert match is not None
+    assert match.similarity >= cache.threshold
+
+
+def test_exact_terms():
+    assert exact_terms(normalize_query("Isn't 2+2 4 meters in C#?")) == {
+        "not",
+        "2+2",
+        "4",
+        "meters",
+        "c#",
+    }
+
+
+def test_signature_of_long_query_is_fast():
+    cache = QueryCache()
+    query = " ".join(f"word{i % 250}" for i in range(300))
+    cache.signature(query)
+
+    started = time.perf_counter()
+    for _ in range(20):
+        cache.signature(query)
+
+    assert (time.perf_counter() - started) / 20 < 0.005
+
+
+def test_normalize_query_keeps_symbols_inside_words():
+    assert normalize_query("Explain C++, C# and 2+2 (3.5)!") == "explain c++ c# and 2+2 3.5"
+
+
+def test_lookup_is_scoped_to_llms():
+    cache = QueryCache()
+    cache.put("Explain quicksort", {"answer": 1}, ["chatgpt", "grok"])
+
+    assert cache.lookup("explain quicksort", ["grok", "chatgpt"]) is not None
+    assert cache.lookup("explain quicksort", ["grok"]) is None
+
+
+def test_cache_is_bounded():
+    cache = QueryCache(max_entries=2)
+    for i in range(3):
+        cache.put(f"question number {i}", {"answer": i})
+
+    assert len(cache) == 2
+    assert cache.lookup("question number 0") is None
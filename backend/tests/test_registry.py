@@ -0,0 +1,90 @@
+import pytest
+
+from config.llm_configs import LLM_CONFIGS, PROVIDER_DEFAULTS, merge_provider_file
+from llms.registry import ProviderRegistry
+
+
+def provider(**overrides):
+    return {
+        **PROVIDER_DEFAULTS,
+        "url": "https://chat.example.com/",
+        "input_selector": "textarea",
+        "response_selector": "div.answer",
+        "wait_time": 20,
+        **overrides,
+    }
+
+
+def test_register_normalizes_name_and_builds_limiter():
+    registry = ProviderRegistry()
+    registry.register(" Example ", provider(max_concurrency=2))
+
+    assert registry.names() == ["example"]
+    assert registry.get("EXAMPLE")["url"] == "https://chat.example.com/"
+    assert registry.get_limiter("example") is not None
+
+
+def test_register_without_limit_has_no_limiter():
+    registry = ProviderRegistry()
+    registry.register("example", provider(max_concurrency=2))
+    registry.register("example", provider())
+
+    assert registry.get_limiter("example") is None
+
+
+@pytest.mark.parametrize(
+    "config",
+    [
+        provider(url=None),
+        provider(selector_type="id"),
+        provider(driver="firefox"),
+        provider(auth_steps=[{"action": "scroll", "selector": "body"}]),
+        provider(auth_steps=[{"action": "click"}]),
+        provider(auth_steps=[{"action": "type", "selector": "input"}]),
+        provider(auth_steps=[{"action": "type", "selector": "input", "value_key": "email"}]),
+    ],
+)
+def test_register_rejects_invalid_config(config):
+    with pytest.raises(ValueError):
+        ProviderRegistry().register("example", config)
+
+
+def test_register_accepts_auth_steps():
+    ProviderRegistry().register(
+        "example",
+        provider(
+            email=None,
+            auth_steps=[
+                {"action": "type", "selector": "input", "value_key": "email", "wait": True},
+                {"action": "click", "selector": "button"},
+                {"action": "wait", "selector_key": "input_selector"},
+            ],
+        ),
+    )
+
+
+def test_merge_provider_file(tmp_path, monkeypatch):
+    monkeypatch.setenv("EXAMPLE_EMAIL", "me@example.com")
+    path = tmp_path / "providers.yaml"
+    path.write_text(
+        "Example:\n"
+        "  url: https://chat.example.com/\n"
+        "  input_selector: textarea\n"
+        "  response_selector: div.answer\n"
+        "  wait_time: 20\n"
+        "  email: ${EXAMPLE_EMAIL}\n"
+        "grok:\n"
+        "  wait_time: 60\n"
+    )
+    configs = {name: dict(config) for name, config in LLM_CONFIGS.items()}
+
+    merge_provider_file(configs, str(path))
+
+    assert configs["example"]["email"] == "me@example.com"
+    assert configs["grok"]["wait_time"] == 60
+    assert configs["grok"]["url"] == LLM_CONFIGS["grok"]["url"]
+
+    registry = ProviderRegistry()
+    for name, config in configs.items():
+        registry.register(name, {**PROVIDER_DEFAULTS, **config})
+    assert registry.get("example")["selector_type"] == "css"
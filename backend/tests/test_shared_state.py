@@ -0,0 +1,111 @@
+import multiprocessing
+import threading
+import time
+
+from utils.query_cache import QueryCache
+from utils.shared_state import SharedState
+
+
+def hold_slot(path, results):
+    state = SharedState(path)
+    with state.provider_slot("grok", 2) as acquired:
+        started = time.time()
+        time.sleep(0.3)
+        results.put((acquired, started, time.time()))
+
+
+def cancelled():
+    event = threading.Event()
+    event.set()
+    return event
+
+
+def test_slots_limit_concurrency_across_processes(tmp_path):
+    path = str(tmp_path / "state.db")
+    SharedState(path)
+    results = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(target=hold_slot, args=(path, results))
+        for _ in range(4)
+    ]
+    for process in processes:
+        process.start()
+    holds = [results.get(timeout=30) for _ in processes]
+    for process in processes:
+        process.join()
+
+    assert all(acquired for acquired, _, _ in holds)
+    # At most 2 holders at the start of any hold
+    for _, started, _ in holds:
+        assert sum(1 for _, s, e in holds if s <= started < e) <= 2
+
+
+def test_acquire_is_cancelled_when_slots_are_taken(tmp_path):
+    state = SharedState(str(tmp_path / "state.db"))
+    holder = state.acquire_slot("grok", 1)
+
+    assert holder is not None
+    assert state.acquire_slot("grok", 1, cancelled()) is None
+    assert state.acquire_slot("mistral", 1, cancelled()) is not None
+
+    state.release_slot("grok", holder)
+    assert state.acquire_slot("grok", 1, cancelled()) is not None
+
+
+def test_expired_lease_frees_the_slot(tmp_path):
+    state = SharedState(str(tmp_path / "state.db"), slot_lease=0.1)
+    state.acquire_slot("grok", 1)
+
+    time.sleep(0.2)
+
+    assert state.acquire_slot("grok", 1, cancelled()) is not None
+
+
+def test_held_slot_is_renewed(tmp_path):
+    state = SharedState(str(tmp_path / "state.db"), slot_lease=0.2)
+
+    with state.provider_slot("grok", 1) as acquired:
+        assert acquired
+        time.sleep(0.5)
+        assert state.acquire_slot("grok", 1, cancelled()) is None
+
+    assert state.acquire_slot("grok", 1, cancelled()) is not None
+
+
+def test_cancelled_provider_slot_yields_false(tmp_path):
+    state = SharedState(str(tmp_path / "state.db"))
+    state.acquire_slot("grok", 1)
+
+    with state.provider_slot("grok", 1, cancelled()) as acquired:
+        assert not acquired
+
+
+def test_query_caches_share_entries(tmp_path):
+    state = SharedState(str(tmp_path / "state.db"))
+    first = QueryCache(shared_state=state)
+    second = QueryCache(shared_state=state)
+
+    first.put("How do I reverse a list in Python?", {"answer": 1}, ["grok"])
+    second.put("Explain quicksort in C++", {"answer": 2}, ["grok"])
+
+    match = second.lookup("how to reverse a python list", ["grok"])
+    assert match is not None
+    assert match.result == {"answer": 1}
+    assert first.lookup("explain quicksort in c++", ["grok"]).result == {"answer": 2}
+    # Each entry is pulled once
+    first.sync()
+    assert len(first) == len(second) == 2
+
+
+def test_shared_cache_entries_are_bounded(tmp_path):
+    state = SharedState(str(tmp_path / "state.db"), max_cache_entries=2)
+    writer = QueryCache(shared_state=state)
+    for i in range(3):
+        writer.put(f"question number {i}", {"answer": i})
+
+    reader = QueryCache(shared_state=state)
+    reader.sync()
+
+    assert len(reader) == 2
+    assert reader.lookup("question number 0") is None
+    assert reader.lookup("question number 2").result == {"answer": 2}
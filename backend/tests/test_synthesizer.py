@@ -0,0 +1,71 @@
+from core.synthesizer import ResponseSynthesizer
+
+
+def sentence(i):
+    return f"Alpha{i} beta{i} gamma{i} delta{i} epsilon{i}."
+
+
+SHARED = "Everyone agrees the shared answer is correct."
+
+
+def response(source, *sentences):
+    return {"source": source, "content": " ".join(sentences), "score": 0.5}
+
+
+def test_highest_agreement_clusters_are_kept():
+    common = [sentence(i) for i in range(16)]
+    responses = [
+        response("chatgpt", *common),
+        response("grok", *common, SHARED),
+        response("mistral", SHARED, sentence(100)),
+        response("deepseek", sentence(200), SHARED),
+    ]
+
+    sentences = list(ResponseSynthesizer(max_sentences=15).synthesize_stream(responses))
+
+    assert len(sentences) == 15
+    assert sentences[-1]["text"] == SHARED
+    assert sentences[-1]["source"] == "grok"
+    assert sentences[-1]["agreement"] == 0.75
+    assert [s["source"] for s in sentences[-1]["supported_by"]] == ["mistral", "deepseek"]
+    # Ties are broken by rank and the kept sentences stay in answer order
+    assert [s["text"] for s in sentences[:-1]] == common[:14]
+    assert all(s["agreement"] == 0.5 for s in sentences[:-1])
+
+
+def test_sentences_without_agreement_are_dropped():
+    responses = [
+        response("chatgpt", sentence(1), sentence(2)),
+        response("grok", sentence(3), sentence(1)),
+    ]
+
+    result = ResponseSynthesizer().synthesize(responses)
+
+    assert [s["text"] for s in result["sentences"]] == [sentence(1)]
+    assert result["sentences"][0]["supported_by"][0]["source"] == "grok"
+    assert result["content"] == sentence(1)
+
+
+def test_single_response_gives_empty_synthesis():
+    result = ResponseSynthesizer().synthesize([response("chatgpt", sentence(1))])
+
+    assert result == {"content": "", "sentences": []}
+
+
+def test_repeated_sentences_are_not_emitted_twice():
+    responses = [
+        response("chatgpt", sentence(1), sentence(1)),
+        response("grok", sentence(1)),
+    ]
+
+    sentences = ResponseSynthesizer().synthesize(responses)["sentences"]
+
+    assert len(sentences) == 1
+
+
+def test_segment_drops_fragments():
+    synthesizer = ResponseSynthesizer(min_sentence_words=4)
+
+    assert synthesizer.segment("# Title\nThis sentence has five words. Too short.") == [
+        "This sentence has five words."
+    ]
@@ -0,0 +1,190 @@
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from selenium.webdriver.common.by import By
+
+from config.llm_configs import get_diagnostics_config
+
+
+logger = logging.getLogger(__name__)
+
+_CAPTURE_ID = re.compile(r"^[\w-]+$")
+_SELECTOR_KEYS = ("input_selector", "response_selector", "completion_selector")
+
+
+class DiagnosticsStore:
+    """
+    Size-bounded on-disk ring buffer of failure captures.
+
+    Each capture is a directory holding `capture.json` (reason, query, stage
+    timings, DOM snippets) and, when available, `screenshot.png`. The oldest
+    captures are deleted once `max_entries` or `max_bytes` is exceeded.
+    """
+
+    def __init__(
+        self,
+        output_dir: str,
+        max_entries: int = 50,
+        max_bytes: int = 50 * 1024 * 1024,
+        dom_snippet_chars: int = 5000,
+    ):
+        self.output_dir = output_dir
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.dom_snippet_chars = dom_snippet_chars
+        self._lock = threading.Lock()
+
+    def capture(
+        self,
+        llm_name: str,
+        driver,
+        config: Dict,
+        query: str,
+        reason: str,
+        timings: Dict[str, float],
+    ) -> Optional[str]:
+        """Capture the page state after a failed run and return the capture id."""
+        capture_id = "_".join(
+            (datetime.now().strftime("%Y%m%d_%H%M%S_%f"), re.sub(r"[^\w-]", "_", llm_name))
+        )
+        capture_dir = os.path.join(self.output_dir, capture_id)
+
+        try:
+            os.makedirs(capture_dir)
+            data = {
+                "id": capture_id,
+                "llm": llm_name,
+                "reason": reason,
+                "query": query,
+                "timings": timings,
+                "timestamp": datetime.now().isoformat(),
+                "screenshot": False,
+            }
+            if driver is not None:
+                data["url"] = driver.current_url
+                data["title"] = driver.title
+                data["dom_snippets"] = self._dom_snippets(driver, config)
+                data["screenshot"] = driver.save_screenshot(
+                    os.path.join(capture_dir, "screenshot.png")
+                )
+
+            with open(os.path.join(capture_dir, "capture.json"), "w") as f:
+                json.dump(data, f, indent=4, default=str)
+            logger.info(f"Stored failure diagnostics for {llm_name} at: {capture_dir}")
+        except Exception as e:
+            logger.error(f"Error capturing diagnostics for {llm_name}: {str(e)}")
+            return None
+        finally:
+            self._enforce_limits()
+
+        return capture_id
+
+    def list(self) -> List[Dict]:
+        """List the stored captures, newest first, without their DOM snippets."""
+        captures = []
+        for capture_id in sorted(self._capture_ids(), reverse=True):
+            data = self.get(capture_id)
+            if data is not None:
+                data.pop("dom_snippets", None)
+                captures.append(data)
+        return captures
+
+    def get(self, capture_id: str) -> Optional[Dict]:
+        """Get a stored capture, or None if it does not exist."""
+        if not _CAPTURE_ID.match(capture_id):
+            return None
+
+        try:
+            with open(os.path.join(self.output_dir, capture_id, "capture.json")) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def screenshot_path(self, capture_id: str) -> Optional[str]:
+        """Get the screenshot path of a stored capture, or None if it has none."""
+        if not _CAPTURE_ID.match(capture_id):
+            return None
+
+        path = os.path.join(self.output_dir, capture_id, "screenshot.png")
+        return path if os.path.isfile(path) else None
+
+    def _dom_snippets(self, driver, config: Dict) -> Dict[str, str]:
+        """Return the HTML around each configured selector, or the page body."""
+        by = By.XPATH if config.get("selector_type") == "xpath" else By.CSS_SELECTOR
+        snippets = {}
+        found = False
+        for key in _SELECTOR_KEYS:
+            selector = config.get(key)
+            if not selector:
+                continue
+
+            elements = driver.find_elements(by, selector)
+            if elements:
+                found = True
+                html = driver.execute_script(
+                    "const el = arguments[0];"
+                    "return (el.parentElement || el).outerHTML;",
+                    elements[-1],
+                )
+            else:
+                html = f"<!-- no element matches {selector} -->"
+            snippets[key] = (html or "")[: self.dom_snippet_chars]
+
+        if not found:
+            body = driver.execute_script("return document.body.outerHTML;")
+            snippets["body"] = (body or "")[: self.dom_snippet_chars]
+
+        return snippets
+
+    def _capture_ids(self) -> List[str]:
+        if not os.path.isdir(self.output_dir):
+            return []
+        return [
+            name
+            for name in os.listdir(self.output_dir)
+            if os.path.isdir(os.path.join(self.output_dir, name))
+        ]
+
+    def _enforce_limits(self):
+        """Delete the oldest captures until the ring buffer fits its limits."""
+        with self._lock:
+            sizes = {}
+            for capture_id in self._capture_ids():
+                capture_dir = os.path.join(self.output_dir, capture_id)
+                try:
+                    sizes[capture_id] = sum(
+                        os.path.getsize(os.path.join(capture_dir, name))
+                        for name in os.listdir(capture_dir)
+                    )
+                except OSError as e:
+                    logger.warning(f"Error reading diagnostics {capture_id}: {str(e)}")
+
+            total = sum(sizes.values())
+            for capture_id in sorted(sizes):
+                if len(sizes) <= self.max_entries and total <= self.max_bytes:
+                    break
+                shutil.rmtree(
+                    os.path.join(self.output_dir, capture_id), ignore_errors=True
+                )
+                total -= sizes.pop(capture_id)
+
+
+_diagnostics_config = get_diagnostics_config()
+
+# None unless diagnostics are enabled, so the success path never touches it
+diagnostics_store = (
+    DiagnosticsStore(
+        _diagnostics_config["path"],
+        max_entries=_diagnostics_config["max_entries"],
+        max_bytes=_diagnostics_config["max_bytes"],
+        dom_snippet_chars=_diagnostics_config["dom_snippet_chars"],
+    )
+    if _diagnostics_config["enabled"]
+    else None
+)
@@ -0,0 +1,297 @@
+import hashlib
+import heapq
+import json
+import logging
+import os
+import random
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+import numpy as np
+
+from utils.shared_state import SharedState
+
+
+logger = logging.getLogger(__name__)
+
+# Words keep inner symbols that change their meaning: c++, c#, 2+2, 3.5, isn't
+_TOKEN = re.compile(r"[\w+#]+(?:[.'’][\w+#]+)*")
+# Numbers and words with symbols (c++, c#, node.js) must match exactly
+_EXACT_CHARS = re.compile(r"\d|[^\w'’]")
+# Words dropped before comparing queries, since rewording them keeps the question
+_STOP_WORDS = frozenset(
+    {
+        "a", "an", "the", "this", "that", "these", "those", "it", "its",
+        "i", "me", "my", "we", "our", "you", "your",
+        "do", "does", "did", "is", "are", "was", "were", "be", "been", "am",
+        "can", "could", "would", "will", "should", "shall",
+        "to", "in", "on", "of", "for", "with", "about", "at", "by", "from", "into", "as",
+        "please", "kindly", "just", "tell", "hi", "hello", "hey", "thanks", "thank",
+    }
+)
+_NEGATIONS = frozenset(
+    {"not", "no", "never", "none", "nor", "neither", "nothing", "nobody", "without", "cannot"}
+)
+_UNITS = frozenset(
+    {
+        "mm", "cm", "m", "km", "meter", "meters", "metre", "metres", "kilometer",
+        "kilometers", "inch", "inches", "ft", "foot", "feet", "yard", "yards",
+        "mile", "miles", "mph", "kph", "mg", "g", "kg", "gram", "grams",
+        "kilogram", "kilograms", "lb", "lbs", "pound", "pounds", "oz", "ounce",
+        "ounces", "ton", "tons", "tonne", "tonnes", "ml", "l", "liter", "liters",
+        "litre", "litres", "gallon", "gallons", "celsius", "fahrenheit", "kelvin",
+        "ms", "second", "seconds", "minute", "minutes", "hour", "hours", "day",
+        "days", "week", "weeks", "month", "months", "year", "years", "kb", "mb",
+        "gb", "tb", "percent", "dollar", "dollars", "usd", "euro", "euros", "eur",
+    }
+)
+
+
+class CacheMatch(NamedTuple):
+    """A cached result for a query similar to the one looked up."""
+
+    matched_query: str
+    similarity: float
+    result: Dict
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase the query and drop punctuation between words and repeated whitespace."""
+    query = unicodedata.normalize("NFKC", query).lower()
+    return " ".join(_TOKEN.findall(query))
+
+
+def content_words(normalized_query: str) -> List[str]:
+    """Return the words of a normalized query that carry its meaning, without 's."""
+    words = (re.sub(r"['’]s$", "", word) for word in normalized_query.split())
+    return [word for word in words if word not in _STOP_WORDS]
+
+
+def exact_terms(normalized_query: str) -> FrozenSet[str]:
+    """
+    Return the words two queries must share to ask the same thing: numbers,
+    negations, units and words with symbols. Contractions count as "not".
+    """
+    terms = set()
+    for word in normalized_query.split():
+        if word.endswith(("n't", "n’t")):
+            terms.add("not")
+        elif word in _NEGATIONS or word in _UNITS or _EXACT_CHARS.search(word):
+            terms.add(word)
+    return frozenset(terms)
+
+
+def shingle(normalized_query: str, size: int = 3, max_words: Optional[int] = None) -> Set[str]:
+    """
+    Return the content words of a normalized query and their character shingles.
+
+    Words are shingled one at a time, so reordering them ("list in python" vs
+    "python list") keeps the shingles, and inflections ("lists") keep most.
+    Beyond `max_words` distinct words, the words with the lowest hashes are kept:
+    a sample of the whole query that is the same for queries sharing the words.
+    """
+    words = set(content_words(normalized_query))
+    if max_words is not None and len(words) > max_words:
+        words = heapq.nsmallest(max_words, words, key=_hash)
+
+    shingles = set()
+    for word in words:
+        shingles.add(word)
+        padded = f" {word} "
+        shingles.update(padded[i : i + size] for i in range(len(padded) - size + 1))
+    return shingles
+
+
+def _hash(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class QueryCache:
+    """
+    Near-duplicate cache of aggregated results, indexed with MinHash/LSH.
+
+    Queries are normalized and shingled, and their MinHash signatures are split
+    into bands; queries sharing a band are candidates, and the best candidate is
+    returned if its estimated Jaccard similarity reaches the threshold and it has
+    the same exact terms (numbers, negations, units and words like c++ vs c#).
+    Entries are only matched within the same scope (the set of LLMs that were
+    queried).
+
+    With a `shared_state`, entries are published to and pulled from the store
+    shared by all API processes, so every worker answers from the same cache.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.7,
+        max_entries: int = 1000,
+        max_words: int = 32,
+        num_perm: int = 64,
+        bands: int = 16,
+        seed: int = 1,
+        shared_state: Optional[SharedState] = None,
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.max_words = max_words
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shared_state = shared_state
+
+        # MinHash permutations are (a * x + b) mod 2^64 with odd a, a bijection on
+        # 64-bit hashes; uint64 arithmetic wraps around, so numpy computes the modulo
+        rng = random.Random(seed)
+        self._a = np.array([rng.getrandbits(64) | 1 for _ in range(num_perm)], dtype=np.uint64)
+        self._b = np.array([rng.getrandbits(64) for _ in range(num_perm)], dtype=np.uint64)
+        self._entries: "OrderedDict[int, Dict]" = OrderedDict()
+        self._buckets: Dict[Tuple, Set[int]] = {}
+        self._next_id = 0
+        self._last_shared_id = 0
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def signature(self, query: str) -> Tuple[int, ...]:
+        """Compute the MinHash signature of a query."""
+        return self._signature(normalize_query(query))
+
+    def _signature(self, normalized_query: str) -> Tuple[int, ...]:
+        shingles = shingle(normalized_query, max_words=self.max_words) or {""}
+        hashes = np.array([_hash(s) for s in shingles], dtype=np.uint64)
+        minimums = (self._a[:, None] * hashes[None, :] + self._b[:, None]).min(axis=1)
+        return tuple(minimums.tolist())
+
+    def lookup(self, query: str, scope: Iterable[str] = ()) -> Optional[CacheMatch]:
+        """Return the cached result of the most similar query above the threshold."""
+        self.sync()
+        scope = tuple(sorted(scope))
+        normalized = normalize_query(query)
+        signature = self._signature(normalized)
+        terms = exact_terms(normalized)
+
+        with self._lock:
+            candidates = set()
+            for band_key in self._band_keys(signature, scope):
+                candidates.update(self._buckets.get(band_key, ()))
+
+            best_id, best_similarity = None, 0.0
+            for entry_id in candidates:
+                if self._entries[entry_id]["terms"] != terms:
+                    continue
+                other = self._entries[entry_id]["signature"]
+                similarity = (
+                    sum(1 for x, y in zip(signature, other) if x == y) / self.num_perm
+                )
+                if similarity > best_similarity:
+                    best_id, best_similarity = entry_id, similarity
+
+            if best_id is None or best_similarity < self.threshold:
+                return None
+
+            self._entries.move_to_end(best_id)
+            entry = self._entries[best_id]
+            return CacheMatch(entry["query"], best_similarity, entry["result"])
+
+    def put(self, query: str, result: Dict, scope: Iterable[str] = ()):
+        """Cache the result of a query, evicting the least recently used entries."""
+        if self.shared_state is None:
+            self._insert(query, result, scope)
+            return
+
+        self.shared_state.add_cache_entry(query, sorted(scope), result)
+        self.sync()
+
+    def sync(self):
+        """Pull the entries other processes added to the shared store."""
+        if self.shared_state is None:
+            return
+
+        with self._sync_lock:
+            try:
+                entries = self.shared_state.cache_entries_since(self._last_shared_id)
+            except Exception as e:
+                logger.error(f"Error syncing query cache: {str(e)}")
+                return
+
+            for entry in entries:
+                self._insert(entry["query"], entry["result"], entry["scope"])
+                self._last_shared_id = entry["id"]
+
+    def _insert(self, query: str, result: Dict, scope: Iterable[str]):
+        scope = tuple(sorted(scope))
+        normalized = normalize_query(query)
+        signature = self._signature(normalized)
+
+        with self._lock:
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = {
+                "query": query,
+                "scope": scope,
+                "result": result,
+                "signature": signature,
+                "terms": exact_terms(normalized),
+            }
+            for band_key in self._band_keys(signature, scope):
+                self._buckets.setdefault(band_key, set()).add(entry_id)
+
+            while len(self._entries) > self.max_entries:
+                self._evict_oldest()
+
+    def save(self, path: str):
+        """Persist the cached queries and results to a JSON file."""
+        with self._lock:
+            entries = [
+                {"query": e["query"], "scope": list(e["scope"]), "result": e["result"]}
+                for e in self._entries.values()
+            ]
+
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        try:
+            with open(path, "w") as f:
+                json.dump(entries, f, default=str)
+            logger.info(f"Saved {len(entries)} cached queries to {path}")
+        except Exception as e:
+            logger.error(f"Error saving query cache: {str(e)}")
+
+    def load(self, path: str):
+        """Load cached queries and results saved with `save`, if the file exists."""
+        if not os.path.exists(path):
+            return
+
+        try:
+            with open(path) as f:
+                entries: List[Dict] = json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading query cache: {str(e)}")
+            return
+
+        for entry in entries:
+            self._insert(entry["query"], entry["result"], entry["scope"])
+        logger.info(f"Loaded {len(entries)} cached queries from {path}")
+
+    def _band_keys(self, signature: Tuple[int, ...], scope: Tuple[str, ...]):
+        for band in range(self.bands):
+            start = band * self.rows
+            yield (scope, band, signature[start : start + self.rows])
+
+    def _evict_oldest(self):
+        entry_id, entry = self._entries.popitem(last=False)
+        for band_key in self._band_keys(entry["signature"], entry["scope"]):
+            bucket = self._buckets.get(band_key)
+            if bucket is not None:
+                bucket.discard(entry_id)
+                if not bucket:
+                    del self._buckets[band_key]
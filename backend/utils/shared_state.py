@@ -0,0 +1,233 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from config.llm_configs import get_shared_state_config
+
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_entries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    query TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    result TEXT NOT NULL,
+    created REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS provider_slots (
+    provider TEXT NOT NULL,
+    holder TEXT NOT NULL,
+    expires REAL NOT NULL,
+    PRIMARY KEY (provider, holder)
+);
+CREATE TABLE IF NOT EXISTS provider_cookies (
+    provider TEXT PRIMARY KEY,
+    cookies TEXT NOT NULL,
+    updated REAL NOT NULL
+);
+"""
+
+
+class SharedState:
+    """
+    State shared by every API process using the same SQLite file.
+
+    Holds the query cache entries, per-provider concurrency slots and browser
+    cookies, so several uvicorn workers coordinate instead of each running its
+    own cache and Chrome fleet. Single-host only: the database uses WAL mode,
+    which needs all processes on one machine, so `path` must be on a local disk.
+    """
+
+    def __init__(self, path: str, slot_lease: float = 600, max_cache_entries: int = 1000):
+        self.path = path
+        self.slot_lease = slot_lease
+        self.max_cache_entries = max_cache_entries
+        self._local = threading.local()
+
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+
+        self._connection().executescript(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return this thread's connection to the database."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        """Run statements in a write transaction, locking out other processes."""
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def add_cache_entry(self, query: str, scope: List[str], result: Dict):
+        """Publish a cached result to the other processes."""
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO cache_entries (query, scope, result, created) VALUES (?, ?, ?, ?)",
+                (query, json.dumps(scope), json.dumps(result, default=str), time.time()),
+            )
+            conn.execute(
+                "DELETE FROM cache_entries WHERE id <= "
+                "(SELECT MAX(id) FROM cache_entries) - ?",
+                (self.max_cache_entries,),
+            )
+
+    def cache_entries_since(self, last_id: int) -> List[Dict]:
+        """Return the cache entries published after `last_id`, oldest first."""
+        rows = self._connection().execute(
+            "SELECT id, query, scope, result FROM cache_entries WHERE id > ? "
+            "ORDER BY id DESC LIMIT ?",
+            (last_id, self.max_cache_entries),
+        )
+        return [
+            {
+                "id": entry_id,
+                "query": query,
+                "scope": json.loads(scope),
+                "result": json.loads(result),
+            }
+            for entry_id, query, scope, result in reversed(rows.fetchall())
+        ]
+
+    def acquire_slot(
+        self,
+        provider: str,
+        limit: int,
+        cancel_event: Optional[threading.Event] = None,
+        poll_interval: float = 0.5,
+    ) -> Optional[str]:
+        """
+        Wait for one of the provider's `limit` concurrency slots.
+
+        Slots are leased for `slot_lease` seconds so a crashed process cannot hold
+        them forever; `provider_slot` renews the lease while the slot is in use.
+        Returns the slot holder id, or None if cancelled meanwhile.
+        """
+        holder = uuid.uuid4().hex
+        while True:
+            with self._transaction() as conn:
+                now = time.time()
+                conn.execute("DELETE FROM provider_slots WHERE expires < ?", (now,))
+                (in_use,) = conn.execute(
+                    "SELECT COUNT(*) FROM provider_slots WHERE provider = ?",
+                    (provider,),
+                ).fetchone()
+                if in_use < limit:
+                    conn.execute(
+                        "INSERT INTO provider_slots (provider, holder, expires) VALUES (?, ?, ?)",
+                        (provider, holder, now + self.slot_lease),
+                    )
+                    return holder
+
+            if cancel_event is None:
+                time.sleep(poll_interval)
+            elif cancel_event.wait(poll_interval):
+                return None
+
+    def renew_slot(self, provider: str, holder: str) -> bool:
+        """Extend the lease of a held slot. Returns False if the lease had expired."""
+        with self._transaction() as conn:
+            renewed = conn.execute(
+                "UPDATE provider_slots SET expires = ? WHERE provider = ? AND holder = ?",
+                (time.time() + self.slot_lease, provider, holder),
+            ).rowcount
+        return renewed > 0
+
+    def release_slot(self, provider: str, holder: str):
+        """Release a slot taken with `acquire_slot`."""
+        with self._transaction() as conn:
+            conn.execute(
+                "DELETE FROM provider_slots WHERE provider = ? AND holder = ?",
+                (provider, holder),
+            )
+
+    @contextmanager
+    def provider_slot(
+        self,
+        provider: str,
+        limit: int,
+        cancel_event: Optional[threading.Event] = None,
+    ):
+        """
+        Hold a provider slot for the duration of the block; yields False if cancelled.
+
+        The lease is renewed in the background, so runs longer than `slot_lease`
+        keep their slot.
+        """
+        holder = self.acquire_slot(provider, limit, cancel_event)
+        if holder is None:
+            yield False
+            return
+
+        released = threading.Event()
+        renewer = threading.Thread(
+            target=self._renew_until, args=(provider, holder, released), daemon=True
+        )
+        renewer.start()
+        try:
+            yield True
+        finally:
+            released.set()
+            renewer.join()
+            self.release_slot(provider, holder)
+
+    def _renew_until(self, provider: str, holder: str, released: threading.Event):
+        """Renew a slot lease every third of `slot_lease` until `released` is set."""
+        while not released.wait(self.slot_lease / 3):
+            try:
+                if not self.renew_slot(provider, holder):
+                    logger.warning(f"Slot lease for {provider} expired while in use")
+                    return
+            except Exception as e:
+                logger.error(f"Error renewing slot lease for {provider}: {str(e)}")
+
+    def save_cookies(self, provider: str, cookies: List[Dict]):
+        """Store the browser cookies of a provider session."""
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO provider_cookies (provider, cookies, updated) "
+                "VALUES (?, ?, ?)",
+                (provider, json.dumps(cookies), time.time()),
+            )
+
+    def load_cookies(self, provider: str) -> List[Dict]:
+        """Return the stored browser cookies of a provider, if any."""
+        row = (
+            self._connection()
+            .execute("SELECT cookies FROM provider_cookies WHERE provider = ?", (provider,))
+            .fetchone()
+        )
+        return json.loads(row[0]) if row else []
+
+
+_shared_state_config = get_shared_state_config()
+
+# None unless LLM_SHARED_STATE_PATH is set, in which case processes coordinate through it
+shared_state = (
+    SharedState(
+        _shared_state_config["path"],
+        slot_lease=_shared_state_config["slot_lease"],
+        max_cache_entries=_shared_state_config["max_cache_entries"],
+    )
+    if _shared_state_config["path"]
+    else None
+)
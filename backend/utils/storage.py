@@ -7,23 +7,26 @@ from datetime import datetime
 logger = logging.getLogger(__name__)
 
 
-def store_result(result, output_dir="results"):
+def store_result(result, output_dir=None):
     """
     Store the result to a JSON file.
 
     Args:
         result: Dictionary containing the result.
-        output_dir: Directory to store the results.
+        output_dir: Directory to store the results. Defaults to LLM_RESULTS_DIR
+            or "results".
 
     Returns:
         Path to the stored file.
     """
 
+    output_dir = output_dir or os.getenv("LLM_RESULTS_DIR", "results")
     if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
+        os.makedirs(output_dir, exist_ok=True)
 
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = os.path.join(output_dir, f"llm_responses_{timestamp}.json")
+    # Microseconds and the process id keep names unique across workers
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    filename = os.path.join(output_dir, f"llm_responses_{timestamp}_{os.getpid()}.json")
 
     try:
         with open(filename, "w") as f: